@@ -32,33 +32,30 @@ or length N arrays, where N is the number of parameterisations to run; N must be
 the same for all parameters of a single model.
 
 """
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 import typing
 
 import numpy as np
-from scipy.interpolate import interp1d
 import scipy.stats as sct
 from scipy.optimize import minimize
 
 from caimira.store.data_registry import DataRegistry
 
-if not typing.TYPE_CHECKING:
-    from memoization import cached
-else:
-    # Workaround issue https://github.com/lonelyenvoy/python-memoization/issues/18
-    # by providing a no-op cache decorator when type-checking.
-    cached = lambda *cached_args, **cached_kwargs: lambda function: function  # noqa
-
 from .utils import method_cache
 
 from .dataclass_utils import nested_replace
 
-oneoverln2 = 1 / np.log(2)
+ln2 = np.log(2)
+oneoverln2 = 1 / ln2
 # Define types for items supporting vectorisation. In the future this may be replaced
 # by ``np.ndarray[<type>]`` once/if that syntax is supported. Note that vectorization
 # implies 1d arrays: multi-dimensional arrays are not supported.
 _VectorisedFloat = typing.Union[float, np.ndarray]
 _VectorisedInt = typing.Union[int, np.ndarray]
+# Times at which a quantity is evaluated all at once (the result being
+# indexed by time along its first axis).
+_Times = typing.Union[typing.Sequence[float], np.ndarray]
 
 Time_t = typing.TypeVar('Time_t', float, int)
 BoundaryPair_t = typing.Tuple[Time_t, Time_t]
@@ -88,12 +85,30 @@ class Interval:
             transitions.update([start, end])
         return transitions
 
-    def triggered(self, time: float) -> bool:
-        """Whether the given time falls inside this interval."""
-        for start, end in self.boundaries():
-            if start < time <= end:
-                return True
-        return False
+    @method_cache
+    def _sorted_boundaries(self) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        The interval starts (sorted), and the running maximum of the
+        corresponding ends, as arrays suitable for a bisection lookup.
+        """
+        boundaries = np.array(self.boundaries(), dtype=np.float64).reshape(-1, 2)
+        boundaries = boundaries[np.argsort(boundaries[:, 0], kind='stable')]
+        return boundaries[:, 0], np.maximum.accumulate(boundaries[:, 1])
+
+    def triggered(self, time: _VectorisedFloat) -> typing.Union[bool, np.ndarray]:
+        """
+        Whether the given time falls inside this interval. Given an array
+        of times, returns an array of booleans.
+        """
+        starts, ends = self._sorted_boundaries()
+        if len(starts) == 0:
+            triggered = np.zeros(np.shape(time), dtype=bool)
+        else:
+            # Index of the latest interval starting strictly before the given time.
+            index = np.searchsorted(starts, time, side='left') - 1
+            triggered = (index >= 0) & (time <= ends[np.maximum(index, 0)])
+        return bool(triggered) if np.ndim(triggered) == 0 else triggered
+
 
 @dataclass(frozen=True)
 class SpecificInterval(Interval):
@@ -119,15 +134,14 @@ class PeriodicInterval(Interval):
     #: Time at which the first person (infected or exposed) arrives at the enclosed space.
     start: float = 0.0
 
+    @method_cache
     def boundaries(self) -> BoundarySequence_t:
         if self.period == 0 or self.duration == 0:
             return tuple()
-        result = []
-        for i in np.arange(self.start, 24, self.period / 60):
-            # NOTE: It is important that the time type is float, not np.float, in
-            # order to allow hashability (for caching).
-            result.append((float(i), float(i+self.duration/60)))
-        return tuple(result)
+        starts = np.arange(self.start, 24, self.period / 60)
+        # NOTE: It is important that the time type is float, not np.float, in
+        # order to allow hashability (for caching) - hence the use of tolist.
+        return tuple(zip(starts.tolist(), (starts + self.duration / 60).tolist()))
 
 
 @dataclass(frozen=True)
@@ -151,17 +165,40 @@ class PiecewiseConstant:
         if not all(shapes[0] == shape for shape in shapes):
             raise ValueError("All values must have the same shape")
 
+    @method_cache
+    def _transition_times_array(self) -> np.ndarray:
+        """
+        The transition times as an array, for bisection lookups.
+        """
+        return np.array(self.transition_times, dtype=np.float64)
+
+    def _value_index(self, time: _VectorisedFloat) -> typing.Union[int, np.ndarray]:
+        """
+        Index of the value applying in the interval (t1, t2] in which the
+        given time falls (an array of indices for an array of times).
+        """
+        return np.searchsorted(self._transition_times_array(), time, side='left') - 1
+
+    @method_cache
+    def _values_array(self) -> np.ndarray:
+        """
+        The values as an array, for vectorised lookups.
+        """
+        return np.array(self.values)
+
     def value(self, time) -> _VectorisedFloat:
+        """
+        The value of the function at the given time. Given an array of
+        times, returns the values stacked along the first axis (one row
+        per time).
+        """
+        if np.ndim(time) > 0:
+            return self._values_array()[np.clip(self._value_index(time), 0, len(self.values) - 1)]
         if time <= self.transition_times[0]:
             return self.values[0]
         elif time > self.transition_times[-1]:
             return self.values[-1]
-
-        for t1, t2, value in zip(self.transition_times[:-1],
-                                 self.transition_times[1:], self.values):
-            if t1 < time <= t2:
-                break
-        return value
+        return self.values[self._value_index(time)]
 
     def interval(self) -> Interval:
         # Build an Interval object
@@ -177,15 +214,21 @@ class PiecewiseConstant:
         # using a linear interpolation in-between the initial mesh points
         refined_times = np.linspace(self.transition_times[0], self.transition_times[-1],
                                     (len(self.transition_times)-1) * refine_factor+1)
-        interpolator = interp1d(
-            self.transition_times,
-            np.concatenate([self.values, self.values[-1:]], axis=0),
-            axis=0)
+        values = np.concatenate([self.values, self.values[-1:]], axis=0)
+
+        # Index of the initial mesh interval in which each refined time falls,
+        # and the relative position of the refined time within it.
+        transition_times = self._transition_times_array()
+        index = np.clip(np.searchsorted(transition_times, refined_times, side='right') - 1,
+                        0, len(self.transition_times) - 2)
+        t1, t2 = transition_times[index], transition_times[index + 1]
+        alpha = ((refined_times - t1) / (t2 - t1)).reshape((-1, ) + (1, ) * (values.ndim - 1))
+        refined_values = values[index] + alpha * (values[index + 1] - values[index])
         return PiecewiseConstant(
             # NOTE: It is important that the time type is float, not np.float, in
             # order to allow hashability (for caching).
             tuple(float(time) for time in refined_times),
-            tuple(interpolator(refined_times)[:-1]),
+            tuple(refined_values[:-1]),
         )
 
 
@@ -196,14 +239,12 @@ class IntPiecewiseConstant(PiecewiseConstant):
     values: typing.Tuple[int, ...]
 
     def value(self, time) -> _VectorisedFloat:
+        if np.ndim(time) > 0:
+            outside = (time <= self.transition_times[0]) | (time > self.transition_times[-1])
+            return np.where(outside, 0, super().value(time))
         if time <= self.transition_times[0] or time > self.transition_times[-1]:
             return 0
-
-        for t1, t2, value in zip(self.transition_times[:-1],
-                                 self.transition_times[1:], self.values):
-            if t1 < time <= t2:
-                break
-        return value
+        return self.values[self._value_index(time)]
 
 
 @dataclass(frozen=True)
@@ -218,6 +259,24 @@ class Room:
     humidity: _VectorisedFloat = 0.5
 
 
+def _times_first(array: np.ndarray, ndim: int) -> np.ndarray:
+    """
+    Append trailing axes to an array indexed by time along its first axis,
+    up to ``ndim`` dimensions, so that it broadcasts against the
+    (vectorised) parameters.
+    """
+    return array.reshape(array.shape + (1, ) * (ndim - array.ndim))
+
+
+def _broadcast_over_times(*arrays: np.ndarray) -> typing.Sequence[np.ndarray]:
+    """
+    Broadcast together arrays indexed by time along their first axis,
+    aligning the (parameter) axes which follow it.
+    """
+    ndim = max(array.ndim for array in arrays)
+    return np.broadcast_arrays(*[_times_first(array, ndim) for array in arrays])
+
+
 @dataclass(frozen=True)
 class _VentilationBase:
     """
@@ -245,6 +304,13 @@ class _VentilationBase:
         """
         return 0.
 
+    def air_exchange_at_times(self, room: Room, times: _Times) -> np.ndarray:
+        """
+        Returns the air exchange rate at each of the given times, stacked
+        along the first axis (one row per time).
+        """
+        return np.stack(np.broadcast_arrays(*[self.air_exchange(room, time) for time in times]))
+
 
 @dataclass(frozen=True)
 class Ventilation(_VentilationBase):
@@ -254,6 +320,14 @@ class Ventilation(_VentilationBase):
     def transition_times(self, room: Room) -> typing.Set[float]:
         return self.active.transition_times()
 
+    def _where_active(self, times: _Times, air_exchange: _VectorisedFloat) -> np.ndarray:
+        """
+        The given (time independent) air exchange at each of the given times
+        at which the ventilation is active, and zero at the others.
+        """
+        active = np.asarray(self.active.triggered(np.asarray(times, dtype=np.float64)))
+        return np.where(_times_first(active, np.ndim(air_exchange) + 1), air_exchange, 0.)
+
 
 @dataclass(frozen=True)
 class MultipleVentilation(_VentilationBase):
@@ -277,10 +351,22 @@ class MultipleVentilation(_VentilationBase):
         Returns the rate at which air is being exchanged in the given room
         at a given time (in hours).
         """
-        return np.array([
-            ventilation.air_exchange(room, time)
-            for ventilation in self.ventilations
-        ], dtype=object).sum(axis=0)
+        total_air_exchange: _VectorisedFloat = 0.
+        for ventilation in self.ventilations:
+            air_exchange = ventilation.air_exchange(room, time)
+            if (isinstance(total_air_exchange, np.ndarray) and
+                    np.shape(air_exchange) in ((), total_air_exchange.shape)):
+                # The total is an array allocated by a previous addition
+                # (never one of the ventilations' results), so that it can
+                # be accumulated into in place.
+                np.add(total_air_exchange, air_exchange, out=total_air_exchange)
+            else:
+                total_air_exchange = total_air_exchange + air_exchange
+        return total_air_exchange
+
+    def air_exchange_at_times(self, room: Room, times: _Times) -> np.ndarray:
+        return np.sum(_broadcast_over_times(
+            *[ventilation.air_exchange_at_times(room, times) for ventilation in self.ventilations]), axis=0)
 
 
 @dataclass(frozen=True)
@@ -333,9 +419,29 @@ class WindowOpening(Ventilation):
         # is inverted.
         inside_temp = np.maximum(inside_temp, outside_temp + self.min_deltaT)  # type: ignore
         temp_gradient = (inside_temp - outside_temp) / outside_temp
-        root = np.sqrt(9.81 * self.window_height * temp_gradient)
+        return (3600 / (3 * room.volume)) * self._opening_factor() * np.sqrt(temp_gradient)
+
+    def air_exchange_at_times(self, room: Room, times: _Times) -> np.ndarray:
+        times_array = np.asarray(times, dtype=np.float64)
+        inside_temp, outside_temp = _broadcast_over_times(
+            np.asarray(room.inside_temp.value(times_array)), np.asarray(self.outside_temp.value(times_array)))
+        inside_temp = np.maximum(inside_temp, outside_temp + self.min_deltaT)
+        root = np.sqrt((inside_temp - outside_temp) / outside_temp)
+
+        prefactor = (3600 / (3 * room.volume)) * self._opening_factor()
+        root = _times_first(root, max(root.ndim, np.ndim(prefactor) + 1))
+        active = _times_first(np.asarray(self.active.triggered(times_array)), root.ndim)
+        return np.where(active, prefactor * root, 0.)
+
+    @method_cache
+    def _opening_factor(self) -> _VectorisedFloat:
+        """
+        The time (and temperature) independent part of the air exchange:
+        the discharge coefficient times the window area, times the square
+        root of gravity times the window height.
+        """
         window_area = self.window_height * self.opening_length * self.number_of_windows
-        return (3600 / (3 * room.volume)) * self.discharge_coefficient * window_area * root
+        return self.discharge_coefficient * window_area * np.sqrt(9.81 * self.window_height)
 
 
 @dataclass(frozen=True)
@@ -365,7 +471,7 @@ class HingedWindow(WindowOpening):
     window_width: _VectorisedFloat = 0.0
 
     def __post_init__(self):
-        if self.window_width is float(0.0):
+        if np.any(np.asarray(self.window_width) == 0.):
             raise ValueError('window_width must be set')
 
     @property
@@ -380,13 +486,10 @@ class HingedWindow(WindowOpening):
         ESFA Output Specification Annex 2F on Ventilation opening areas.
         """
         window_ratio = np.array(self.window_width / self.window_height)
-        coefs = np.empty(window_ratio.shape + (2, ), dtype=np.float64)
-
-        coefs[window_ratio < 0.5] = (0.06, 0.612)
-        coefs[np.bitwise_and(0.5 <= window_ratio, window_ratio < 1)] = (0.048, 0.589)
-        coefs[np.bitwise_and(1 <= window_ratio, window_ratio < 2)] = (0.04, 0.563)
-        coefs[window_ratio >= 2] = (0.038, 0.548)
-        M, cd_max = coefs.T
+        # Coefficients (M, cd_max) for window ratios in [0, 0.5), [0.5, 1),
+        # [1, 2) and [2, inf), respectively.
+        coefs = np.array([(0.06, 0.612), (0.048, 0.589), (0.04, 0.563), (0.038, 0.548)])
+        M, cd_max = coefs[np.digitize(window_ratio, (0.5, 1., 2.))].T
 
         window_angle = 2.*np.rad2deg(np.arcsin(self.opening_length/(2.*self.window_height)))
         return cd_max*(1-np.exp(-M*window_angle))
@@ -408,6 +511,9 @@ class HEPAFilter(Ventilation):
         # Reminder, no dependence on time in the resulting calculation.
         return self.q_air_mech / room.volume
 
+    def air_exchange_at_times(self, room: Room, times: _Times) -> np.ndarray:
+        return self._where_active(times, self.q_air_mech / room.volume)
+
 
 @dataclass(frozen=True)
 class HVACMechanical(Ventilation):
@@ -425,6 +531,9 @@ class HVACMechanical(Ventilation):
         # Reminder, no dependence on time in the resulting calculation.
         return self.q_air_mech / room.volume
 
+    def air_exchange_at_times(self, room: Room, times: _Times) -> np.ndarray:
+        return self._where_active(times, self.q_air_mech / room.volume)
+
 
 @dataclass(frozen=True)
 class AirChange(Ventilation):
@@ -443,6 +552,9 @@ class AirChange(Ventilation):
         # Reminder, no dependence on time in the resulting calculation.
         return self.air_exch
 
+    def air_exchange_at_times(self, room: Room, times: _Times) -> np.ndarray:
+        return self._where_active(times, self.air_exch)
+
 
 @dataclass(frozen=True)
 class CustomVentilation(_VentilationBase):
@@ -483,7 +595,7 @@ class Virus:
 
     def decay_constant(self, humidity: _VectorisedFloat, inside_temp: _VectorisedFloat) -> _VectorisedFloat:
         # Viral inactivation per hour (h^-1) (function of humidity and inside temperature)
-        return np.log(2) / self.halflife(humidity, inside_temp)
+        return ln2 / self.halflife(humidity, inside_temp)
 
 
 @dataclass(frozen=True)
@@ -501,7 +613,7 @@ class SARSCoV2(Virus):
         # with a maximum at hl = 6.43 (compensate for the negative decay values in the paper).
         # Note that humidity is in percentage and inside_temp in °C.
         # factor np.log(2) -> decay rate to half-life; factor 60 -> minutes to hours
-        hl_calc = ((np.log(2)/((0.16030 + 0.04018*(((inside_temp-273.15)-20.615)/10.585)
+        hl_calc = ((ln2/((0.16030 + 0.04018*(((inside_temp-273.15)-20.615)/10.585)
                                        +0.02176*(((humidity*100)-45.235)/28.665)
                                        -0.14369
                                        -0.02636*((inside_temp-273.15)-20.615)/10.585)))/60)
@@ -689,6 +801,17 @@ class _ExpirationBase:
         """
         Total volume of aerosols expired per volume of exhaled air (mL/cm^3).
         """
+        cached = self._aerosols_by_mask().get(id(mask))
+        if cached is not None and cached[0] is mask:
+            return cached[1]
+        aerosols = self._aerosols(mask)
+        self._aerosols_by_mask()[id(mask)] = (mask, aerosols)
+        return aerosols
+
+    def _aerosols(self, mask: Mask) -> _VectorisedFloat:
+        """
+        The (uncached) aerosols, as returned by :meth:`aerosols`.
+        """
         raise NotImplementedError("Subclass must implement")
 
     def jet_origin_concentration(self):
@@ -697,6 +820,15 @@ class _ExpirationBase:
         """
         raise NotImplementedError("Subclass must implement")
 
+    @method_cache
+    def _aerosols_by_mask(self) -> typing.Dict[int, typing.Tuple[Mask, _VectorisedFloat]]:
+        """
+        The aerosols computed so far, keyed by the identity of the mask (which
+        may hold arrays, and so not be hashable). The mask is kept alongside
+        so that its identity cannot be reused by another mask.
+        """
+        return {}
+
 
 @dataclass(frozen=True)
 class Expiration(_ExpirationBase):
@@ -720,26 +852,27 @@ class Expiration(_ExpirationBase):
         """
         return Particle(diameter=self.diameter)
 
-    @cached()
-    def aerosols(self, mask: Mask):
+    def _aerosols(self, mask: Mask) -> _VectorisedFloat:
         """
         Total volume of aerosols expired per volume of exhaled air.
         Result is in mL.cm^-3
         """
-        def volume(d):
-            return (np.pi * d**3) / 6.
-
         # Final result converted from microns^3/cm3 to mL/cm^3
-        return self.cn * (volume(self.diameter) *
+        return self.cn * (self._volume() *
                 (1 - mask.exhale_efficiency(self.diameter))) * 1e-12
 
-    @cached()
+    @method_cache
     def jet_origin_concentration(self):
-        def volume(d):
-            return (np.pi * d**3) / 6.
-
         # Final result converted from microns^3/cm3 to mL/m3
-        return self.cn * volume(self.diameter) * 1e-6
+        return self.cn * self._volume() * 1e-6
+
+    @method_cache
+    def _volume(self) -> _VectorisedFloat:
+        """
+        Volume of an aerosol of the given diameter (in microns^3), shared
+        by the (mask-dependent) aerosols and the jet origin concentration.
+        """
+        return (np.pi * self.diameter**3) / 6.
 
 
 @dataclass(frozen=True)
@@ -762,11 +895,11 @@ class MultipleExpiration(_ExpirationBase):
         if not all(np.isscalar(e.diameter) for e in self.expirations):
             raise ValueError("diameters must all be scalars")
 
-    def aerosols(self, mask: Mask):
-        return np.array([
-            weight * expiration.aerosols(mask) / sum(self.weights)
-            for weight,expiration in zip(self.weights,self.expirations)
-        ]).sum(axis=0)
+    def _aerosols(self, mask: Mask) -> _VectorisedFloat:
+        weights = np.array(self.weights) / sum(self.weights)
+        return np.dot(weights, np.array([
+            expiration.aerosols(mask) for expiration in self.expirations
+        ]))
 
 
 # Typical expirations. The aerosol diameter given is an equivalent
@@ -835,19 +968,20 @@ class SimplePopulation:
         elif isinstance(self.number, IntPiecewiseConstant):
             return self.number.interval()
 
-    def person_present(self, time: float):
+    def person_present(self, time: _VectorisedFloat):
         # Allow back-compatibility
         if isinstance(self.number, int) and isinstance(self.presence, Interval):
             return self.presence.triggered(time)
         elif isinstance(self.number, IntPiecewiseConstant):
             return self.number.value(time) != 0
 
-    def people_present(self, time: float):
+    def people_present(self, time: _VectorisedFloat):
         # Allow back-compatibility
         if isinstance(self.number, int):
             return self.number * self.person_present(time)
         else:
-            return int(self.number.value(time))
+            people_present = self.number.value(time)
+            return int(people_present) if np.ndim(people_present) == 0 else np.asarray(people_present).astype(int)
 
 
 @dataclass(frozen=True)
@@ -921,6 +1055,16 @@ class _PopulationWithVirus(Population):
         # like Ventilation.
         return self.emission_rate_per_person_when_present() * self.people_present(time)
 
+    def emission_rate_array(self, times: _Times) -> np.ndarray:
+        """
+        The vectorised version of :meth:`emission_rate`, for an array of
+        times. The result is indexed by time along its first axis.
+        """
+        # Nobody present means no emission (people_present is then zero).
+        people_present = self.people_present(np.asarray(times, dtype=np.float64))
+        emission_rate = self.emission_rate_per_person_when_present()
+        return _times_first(people_present, np.ndim(emission_rate) + 1) * emission_rate
+
     @property
     def particle(self) -> Particle:
         """
@@ -965,6 +1109,7 @@ class InfectedPopulation(_PopulationWithVirus):
         """
         return self.virus.viable_to_RNA_ratio * (1 - self.host_immunity)
 
+    @method_cache
     def aerosols(self):
         """
         Total volume of aerosols expired per volume of exhaled air (mL/cm^3).
@@ -1062,7 +1207,6 @@ class _ConcentrationModelBase:
         """
         raise NotImplementedError("Subclass must implement")
 
-    @method_cache
     def _normed_concentration_limit(self, time: float) -> _VectorisedFloat:
         """
         Provides a constant that represents the theoretical asymptotic
@@ -1076,12 +1220,8 @@ class _ConcentrationModelBase:
         V = self.room.volume
         RR = self.removal_rate(time)
 
-        if isinstance(RR, np.ndarray):
-            invRR = np.empty(RR.shape, dtype=np.float64)
-            invRR[RR == 0.] = np.nan
-            invRR[RR != 0.] = 1. / RR[RR != 0.]
-        else:
-            invRR = np.nan if RR == 0. else 1. / RR # type: ignore
+        # The inverse removal rate, undefined (nan) where the removal rate is zero.
+        invRR = np.divide(1., RR, out=np.full(np.shape(RR), np.nan), where=(RR != 0.))
 
         return (self.population.people_present(time) * invRR / V +
                 self.min_background_concentration()/self.normalization_factor())
@@ -1097,6 +1237,13 @@ class _ConcentrationModelBase:
         state_change_times.update(self.ventilation.transition_times(self.room))
         return sorted(state_change_times)
 
+    @method_cache
+    def _state_change_times_array(self) -> np.ndarray:
+        """
+        The state change times as an array, for vectorised lookups.
+        """
+        return np.array(self.state_change_times(), dtype=np.float64)
+
     @method_cache
     def _first_presence_time(self) -> float:
         """
@@ -1104,6 +1251,44 @@ class _ConcentrationModelBase:
         """
         return self.population.presence_interval().boundaries()[0][0]
 
+    @method_cache
+    def _air_exchanges_at_state_changes(self) -> np.ndarray:
+        """
+        The air exchange at each of the state_change_times, evaluated for
+        all of them at once (indexed by state change along the first axis).
+        """
+        return self.ventilation.air_exchange_at_times(self.room, self._state_change_times_array())
+
+    def _air_exchange(self, time: float) -> _VectorisedFloat:
+        """
+        The air exchange at the given time, taken from the batched values
+        when the time is a state change (as in the concentration sweep).
+        """
+        state_change_times = self.state_change_times()
+        t_index = bisect_left(state_change_times, time)
+        if t_index < len(state_change_times) and state_change_times[t_index] == time:
+            return self._air_exchanges_at_state_changes()[t_index]
+        return self.ventilation.air_exchange(self.room, time)
+
+    def _last_state_change_index(self, time: float) -> int:
+        """
+        Index, in the state_change_times, of the most recent/previous state
+        change (see :meth:`last_state_change`).
+        """
+        t_index = bisect_left(self.state_change_times(), time)
+        # Bisection gives us the index to insert the given time. Instead we
+        # want to get the index of the most recent time, so reduce the index by
+        # one unless we are already at 0.
+        return max([t_index - 1, 0])
+
+    def _last_state_change_indices(self, times: np.ndarray) -> np.ndarray:
+        """
+        The vectorised version of :meth:`_last_state_change_index`, for an
+        array of times.
+        """
+        t_indices = np.searchsorted(self._state_change_times_array(), times, side='left')
+        return np.maximum(t_indices - 1, 0)
+
     def last_state_change(self, time: float) -> float:
         """
         Find the most recent/previous state change.
@@ -1112,25 +1297,20 @@ class _ConcentrationModelBase:
         change exactly at ``time`` the previous state change is returned
         (except at ``time == 0``).
         """
-        times = self.state_change_times()
-        t_index: int = np.searchsorted(times, time)  # type: ignore
-        # Search sorted gives us the index to insert the given time. Instead we
-        # want to get the index of the most recent time, so reduce the index by
-        # one unless we are already at 0.
-        t_index = max([t_index - 1, 0])
-        return times[t_index]
+        return self.state_change_times()[self._last_state_change_index(time)]
 
     def _next_state_change(self, time: float) -> float:
         """
         Find the nearest future state change.
         """
-        for change_time in self.state_change_times():
-            if change_time >= time:
-                return change_time
-        raise ValueError(
-            f"The requested time ({time}) is greater than last available "
-            f"state change time ({change_time})"
-        )
+        state_change_times = self.state_change_times()
+        t_index = bisect_left(state_change_times, time)
+        if t_index == len(state_change_times):
+            raise ValueError(
+                f"The requested time ({time}) is greater than last available "
+                f"state change time ({state_change_times[-1]})"
+            )
+        return state_change_times[t_index]
 
     @method_cache
     def _normed_concentration_cached(self, time: float) -> _VectorisedFloat:
@@ -1157,25 +1337,65 @@ class _ConcentrationModelBase:
         if time <= self._first_presence_time():
             return self.min_background_concentration()/self.normalization_factor()
 
+        t_index = self._last_state_change_index(time)
+        state_change_times = self.state_change_times()
+        if t_index + 1 < len(state_change_times) and state_change_times[t_index + 1] == time:
+            # The concentration at a state change is already part of the sweep.
+            return self._normed_concentration_at_state_change(t_index + 1)
+        return self._normed_concentration_from_state_change(
+            time, state_change_times[t_index],
+            self._normed_concentration_at_state_change(t_index))
+
+    @method_cache
+    def _normed_concentrations_at_state_changes(self) -> typing.List[_VectorisedFloat]:
+        """
+        Normalized concentrations at the first state_change_times. This list
+        is extended on demand by :meth:`_normed_concentration_at_state_change`.
+        """
+        return []
+
+    def _normed_concentration_at_state_change(self, t_index: int) -> _VectorisedFloat:
+        """
+        Normalized concentration at the state change time of the given index.
+
+        The concentrations are computed in a forward sweep, each state change
+        being evolved from the previous one, rather than recursively from
+        the latest requested time backwards.
+        """
+        concentrations = self._normed_concentrations_at_state_changes()
+        state_change_times = self.state_change_times()
+        while len(concentrations) <= t_index:
+            index = len(concentrations)
+            time = state_change_times[index]
+            if index == 0:
+                concentrations.append(self.min_background_concentration()/self.normalization_factor())
+            elif time <= self._first_presence_time():
+                # Still the background concentration: share the same value.
+                concentrations.append(concentrations[-1])
+            else:
+                concentrations.append(self._normed_concentration_from_state_change(
+                    time, state_change_times[index - 1], concentrations[-1]))
+        return concentrations[t_index]
+
+    def _normed_concentration_from_state_change(self, time: float,
+                                                t_last_state_change: float,
+                                                conc_at_last_state_change: _VectorisedFloat) -> _VectorisedFloat:
+        """
+        Normalized concentration at the given time, evolved from the
+        (normalized) concentration at the most recent state change.
+        """
         next_state_change_time = self._next_state_change(time)
         RR = self.removal_rate(next_state_change_time)
-
-        t_last_state_change = self.last_state_change(time)
-        conc_at_last_state_change = self._normed_concentration_cached(t_last_state_change)
         delta_time = time - t_last_state_change
 
         fac = np.exp(-RR * delta_time)
-        if isinstance(RR, np.ndarray):
-            curr_conc_state = np.empty(RR.shape, dtype=np.float64)
-            curr_conc_state[RR == 0.] = delta_time * self.population.people_present(time) / (
-                self.room.volume[RR == 0.] if isinstance(self.room.volume,np.ndarray) else self.room.volume)
-            curr_conc_state[RR != 0.] = self._normed_concentration_limit(next_state_change_time)[RR != 0.] * (1 - fac[RR != 0.])
-        else:
-            if RR == 0.:
-                curr_conc_state = delta_time * self.population.people_present(time) / self.room.volume
-            else:
-                curr_conc_state = self._normed_concentration_limit(next_state_change_time) * (1 - fac)
-
+        # Where the removal rate is zero the concentration grows linearly,
+        # otherwise it tends exponentially to the concentration limit.
+        curr_conc_state = np.where(
+            RR == 0.,
+            delta_time * self.population.people_present(time) / self.room.volume,
+            self._normed_concentration_limit(next_state_change_time) * (1 - fac),
+        )
         return curr_conc_state + conc_at_last_state_change * fac
 
     def concentration(self, time: float) -> _VectorisedFloat:
@@ -1189,6 +1409,66 @@ class _ConcentrationModelBase:
         return (self._normed_concentration_cached(time) *
                 self.normalization_factor())
 
+    def _normed_concentration_array(self, times: np.ndarray) -> np.ndarray:
+        """
+        The vectorised version of :meth:`_normed_concentration`, for an
+        array of times. The result is indexed by time along its first axis.
+        """
+        state_change_times = self.state_change_times()
+        if times.size and times.max() > state_change_times[-1]:
+            # Raises the same error as the scalar version.
+            self._next_state_change(float(times.max()))
+
+        # Group the times by the state change interval they fall in, the
+        # concentration being evolved analytically within each interval.
+        background = times <= self._first_presence_time()
+        t_indices = self._last_state_change_indices(times)
+        groups = [(background, np.multiply.outer(
+            np.ones(np.count_nonzero(background)),
+            self.min_background_concentration()/self.normalization_factor()))]
+        for t_index in np.unique(t_indices[~background]):
+            selected = ~background & (t_indices == t_index)
+            t_last_state_change = state_change_times[t_index]
+            next_state_change_time = state_change_times[t_index + 1]
+            RR = self.removal_rate(next_state_change_time)
+            conc_at_last_state_change = self._normed_concentration_at_state_change(t_index)
+            # The occupancy is constant within the interval.
+            people_per_volume = self.population.people_present(
+                (t_last_state_change + next_state_change_time) / 2) / self.room.volume
+
+            delta_time = _times_first(
+                times[selected] - t_last_state_change,
+                1 + max(np.ndim(RR), np.ndim(conc_at_last_state_change), np.ndim(people_per_volume)))
+            fac = np.exp(-RR * delta_time)
+            curr_conc_state = np.where(
+                RR == 0.,
+                delta_time * people_per_volume,
+                self._normed_concentration_limit(next_state_change_time) * (1 - fac),
+            )
+            concentrations = curr_conc_state + conc_at_last_state_change * fac
+            # The concentration at a state change is already part of the sweep.
+            concentrations[times[selected] == next_state_change_time] = \
+                self._normed_concentration_at_state_change(t_index + 1)
+            groups.append((selected, concentrations))
+
+        shape = np.broadcast_shapes(*[concentrations.shape[1:] for _, concentrations in groups])
+        result = np.empty(times.shape + shape)
+        for selected, concentrations in groups:
+            result[selected] = _times_first(concentrations, 1 + len(shape))
+        return result
+
+    def concentration_array(self, times: _Times) -> np.ndarray:
+        """
+        The vectorised version of :meth:`concentration`, for an array of
+        times. The result is indexed by time along its first axis, followed
+        by the axis of the vectorised parameters (if any).
+        """
+        normed_concentrations = self._normed_concentration_array(np.asarray(times, dtype=np.float64))
+        normalization_factor = self.normalization_factor()
+        return _times_first(normed_concentrations,
+                            max(normed_concentrations.ndim, np.ndim(normalization_factor) + 1)
+                            ) * normalization_factor
+
     @method_cache
     def normed_integrated_concentration(self, start: float, stop: float) -> _VectorisedFloat:
         """
@@ -1199,10 +1479,14 @@ class _ConcentrationModelBase:
             return (stop - start)*self.min_background_concentration()/self.normalization_factor()
         state_change_times = self.state_change_times()
         req_start, req_stop = start, stop
+        # Only the state change intervals overlapping the requested range
+        # contribute to the integral: find them by bisection rather than
+        # scanning the whole list of state changes.
+        first = max(bisect_left(state_change_times, req_start) - 1, 0)
+        last = bisect_right(state_change_times, req_stop)
+        state_change_times = state_change_times[first:last + 1]
         total_normed_concentration = 0.
         for interval_start, interval_stop in zip(state_change_times[:-1], state_change_times[1:]):
-            if req_start > interval_stop or req_stop < interval_start:
-                continue
             # Clip the current interval to the requested range.
             start = max([interval_start, req_start])
             stop = min([interval_stop, req_stop])
@@ -1256,16 +1540,23 @@ class ConcentrationModel(_ConcentrationModelBase):
         # we normalize by the emission rate
         return self.infected.emission_rate_per_person_when_present()
 
-    def removal_rate(self, time: float) -> _VectorisedFloat:
+    @method_cache
+    def _deposition_rate(self) -> _VectorisedFloat:
+        """
+        Deposition rate (h^-1) of the particles toward the floor. It does
+        not depend on time.
+        """
         # Equilibrium velocity of particle motion toward the floor
         vg = self.infected.particle.settling_velocity(self.evaporation_factor)
         # Height of the emission source to the floor - i.e. mouth/nose (m)
         h = 1.5
-        # Deposition rate (h^-1)
-        k = (vg * 3600) / h
+        return (vg * 3600) / h
+
+    @method_cache
+    def removal_rate(self, time: float) -> _VectorisedFloat:
         return (
-            k + self.virus.decay_constant(self.room.humidity, self.room.inside_temp.value(time))
-            + self.ventilation.air_exchange(self.room, time)
+            self._deposition_rate() + self.virus.decay_constant(self.room.humidity, self.room.inside_temp.value(time))
+            + self._air_exchange(time)
         )
 
     def infectious_virus_removal_rate(self, time: float) -> _VectorisedFloat:
@@ -1295,8 +1586,9 @@ class CO2ConcentrationModel(_ConcentrationModelBase):
     def population(self) -> SimplePopulation:
         return self.CO2_emitters
 
+    @method_cache
     def removal_rate(self, time: float) -> _VectorisedFloat:
-        return self.ventilation.air_exchange(self.room, time)
+        return self._air_exchange(time)
 
     def min_background_concentration(self) -> _VectorisedFloat:
         """
@@ -1331,6 +1623,7 @@ class ShortRangeModel:
     #: Interpersonal distances
     distance: _VectorisedFloat
 
+    @method_cache
     def dilution_factor(self) -> _VectorisedFloat:
         '''
         The dilution factor for the respective expiratory activity type.
@@ -1533,7 +1826,7 @@ class CO2DataModel:
                     exhalation_rate=exhalation_rate, inhalation_rate=exhalation_rate),
             )
         )
-        return [CO2_concentrations.concentration(time) for time in self.times]
+        return list(CO2_concentrations.concentration_array(self.times))
 
     def CO2_fit_params(self):
         if len(self.times) != len(self.CO2_concentrations):
@@ -1605,8 +1898,9 @@ class ExposureModel:
         if (isinstance(c_model.infected, InfectedPopulation) and not np.isscalar(c_model.infected.expiration.diameter)
             # Check if the diameter-independent elements of the infectious_virus_removal_rate method are vectorised.
             and not (
-                all(np.isscalar(c_model.virus.decay_constant(c_model.room.humidity, c_model.room.inside_temp.value(time)) +
-                c_model.ventilation.air_exchange(c_model.room, time)) for time in c_model.state_change_times()))):
+                c_model._air_exchanges_at_state_changes().ndim == 1 and
+                all(np.isscalar(c_model.virus.decay_constant(c_model.room.humidity, c_model.room.inside_temp.value(time)))
+                    for time in c_model.state_change_times()))):
             raise ValueError("If the diameter is an array, none of the ventilation parameters "
                              "or virus decay constant can be arrays at the same time.")
 
@@ -1621,6 +1915,7 @@ class ExposureModel:
 
         return sorted(state_change_times)
 
+    @method_cache
     def long_range_fraction_deposited(self) -> _VectorisedFloat:
         """
         The fraction of particles actually deposited in the respiratory
@@ -1641,14 +1936,9 @@ class ExposureModel:
                 continue
             elif start > time2:
                 break
-            elif start <= time1 and time2<= stop:
-                exposure += self.concentration_model.normed_integrated_concentration(time1, time2)
-            elif start <= time1 and stop < time2:
-                exposure += self.concentration_model.normed_integrated_concentration(time1, stop)
-            elif time1 < start and time2 <= stop:
-                exposure += self.concentration_model.normed_integrated_concentration(start, time2)
-            elif time1 <= start and stop < time2:
-                exposure += self.concentration_model.normed_integrated_concentration(start, stop)
+            # Integrate over the overlap of the presence and [time1, time2].
+            exposure += self.concentration_model.normed_integrated_concentration(
+                max(start, time1), min(stop, time2))
         return exposure
 
     def concentration(self, time: float) -> _VectorisedFloat:
@@ -1751,6 +2041,7 @@ class ExposureModel:
 
         return deposited_exposure
 
+    @method_cache
     def _deposited_exposure_list(self):
         """
         The number of virus per m^3 deposited on the respiratory tract.
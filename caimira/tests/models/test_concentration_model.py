@@ -142,6 +142,11 @@ def test_last_state_change_time(
 ):
     assert simple_conc_model.last_state_change(float(time)) == expected_last_state_change
 
+    # The vectorised lookup agrees with the scalar one.
+    indices = simple_conc_model._last_state_change_indices(np.array([time, time]))
+    npt.assert_array_equal(
+        simple_conc_model._state_change_times_array()[indices], expected_last_state_change)
+
 
 @pytest.mark.parametrize(
     "time, expected_next_state_change", [
@@ -172,6 +177,16 @@ def test_next_state_change_time_out_of_range(simple_conc_model: models.Concentra
         simple_conc_model._next_state_change(3.1)
 
 
+@pytest.mark.parametrize("time", [0., 0.5, 0.75, 1., 1.1, 2., 2.5, 3.])
+def test_removal_rate_at_state_changes(simple_conc_model: models.ConcentrationModel, time):
+    # The batched air exchange at the state changes agrees with the scalar one.
+    c_model = simple_conc_model
+    expected = (c_model._deposition_rate()
+                + c_model.virus.decay_constant(c_model.room.humidity, c_model.room.inside_temp.value(time))
+                + c_model.ventilation.air_exchange(c_model.room, time))
+    npt.assert_allclose(c_model.removal_rate(time), expected)
+
+
 def test_first_presence_time(simple_conc_model):
     assert simple_conc_model._first_presence_time() == 0.5
 
@@ -286,3 +301,49 @@ def test_zero_ventilation_rate(
 
     normed_concentration = known_conc_model.concentration(1)
     assert normed_concentration == pytest.approx(expected_concentration, abs=1e-6)
+
+
+@pytest.mark.parametrize([
+    "known_removal_rate",
+    "known_min_background_concentration",
+    "known_normalization_factor"],
+    [
+        [100., 0., 10.],
+        [0., 240., 1.],
+        [np.array([0.25, 10]), 0.0, 10.],
+        [100, 440.0, np.array([10., 20.])],
+        [np.array([0., 100,]), np.array([1000.,1100.]), np.array([10., 20.])],
+    ]
+)
+def test_concentration_array(
+    data_registry: DataRegistry,
+    simple_conc_model: models.ConcentrationModel,
+    dummy_population: models.Population,
+    known_removal_rate: float,
+    known_min_background_concentration: float,
+    known_normalization_factor: float):
+
+    known_conc_model = KnownConcentrationModelBase(
+        data_registry = data_registry,
+        room = simple_conc_model.room,
+        ventilation = simple_conc_model.ventilation,
+        known_population = dummy_population,
+        known_removal_rate = known_removal_rate,
+        known_min_background_concentration = known_min_background_concentration,
+        known_normalization_factor = known_normalization_factor)
+
+    # Include the state change times, and times before the first presence.
+    times = np.concatenate([np.linspace(0., 3., 31), known_conc_model.state_change_times()])
+    concentrations = known_conc_model.concentration_array(times)
+
+    expected_concentrations = [known_conc_model.concentration(float(time)) for time in times]
+    assert concentrations.shape == times.shape + np.shape(expected_concentrations[-1])
+    npt.assert_allclose(concentrations, np.stack(np.broadcast_arrays(*expected_concentrations)), rtol=1e-12)
+
+
+def test_concentration_array_out_of_range(simple_conc_model: models.ConcentrationModel):
+    with pytest.raises(
+            ValueError,
+            match=re.escape("The requested time (3.1) is greater than last available state change time (3.0)")
+    ):
+        simple_conc_model.concentration_array(np.array([1., 3.1]))
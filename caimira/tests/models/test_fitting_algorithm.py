@@ -32,10 +32,7 @@ def test_fitting_algorithm(data_registry, activity_type, ventilation_active, air
     )
 
     times = np.linspace(8, 17, 100)
-    CO2_concentrations = [
-        conc_model.concentration(float(time))
-        for time in times
-    ]
+    CO2_concentrations = conc_model.concentration_array(times)
 
     # Generate CO2DataModel
     data_model = models.CO2DataModel(
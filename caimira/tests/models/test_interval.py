@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from caimira import models
+
+
+@pytest.mark.parametrize(
+    "time, expected_value",
+    [
+        [0., False],
+        [1., False],
+        [1.5, True],
+        [2., True],
+        [2.5, False],
+        [4., False],
+        [4.5, True],
+        [6., True],
+        [6.1, False],
+    ],
+)
+def test_specific_interval_triggered(time, expected_value):
+    interval = models.SpecificInterval(((1., 2.), (4., 6.)))
+    assert interval.triggered(time) is expected_value
+
+
+@pytest.mark.parametrize(
+    "time, expected_value",
+    [
+        [0., False],
+        [0.5, True],
+        [1.5, True],
+        [23.99, True],
+        [24.5, True],
+        [25.1, False],
+    ],
+)
+def test_periodic_interval_triggered_overlapping(time, expected_value):
+    # A duration greater than the period: the event is permanently occurring.
+    interval = models.PeriodicInterval(period=60, duration=120)
+    assert interval.triggered(time) is expected_value
+
+
+def test_empty_interval_triggered():
+    assert models.PeriodicInterval(period=0, duration=0).triggered(1.) is False
+
+
+@pytest.mark.parametrize(
+    "interval", [
+        models.SpecificInterval(((1., 2.), (4., 6.))),
+        models.PeriodicInterval(period=60, duration=120),
+        models.PeriodicInterval(period=120, duration=15, start=8.),
+        models.PeriodicInterval(period=0, duration=0),
+    ]
+)
+def test_triggered_vectorisation(interval):
+    times = np.linspace(-1., 26., 541)
+    triggered = interval.triggered(times)
+    assert isinstance(triggered, np.ndarray)
+    np.testing.assert_array_equal(
+        triggered, np.fromiter((interval.triggered(time) for time in times), dtype=bool, count=len(times)))
@@ -41,6 +41,18 @@ def test_piecewiseconstant(time, expected_value):
     assert fun.value(time) == expected_value
 
 
+@pytest.mark.parametrize(
+    "fun", [
+        models.PiecewiseConstant((0, 8, 16, 24), (2, 5, 8)),
+        models.PiecewiseConstant((0, 8, 16, 24), (np.array([2, 3]), np.array([5, 7]), np.array([8, 9]))),
+        models.IntPiecewiseConstant((0, 8, 16, 24), (2, 0, 8)),
+    ]
+)
+def test_piecewiseconstant_vectorisation(fun):
+    times = np.array([-1, 0, 4, 8, 10, 16, 20.5, 24, 25])
+    np.testing.assert_array_equal(fun.value(times), [fun.value(time) for time in times])
+
+
 def test_piecewiseconstant_interp():
     transition_times = (0, 8, 16, 24)
     values = (2, 5, 8)
@@ -63,8 +75,8 @@ def test_constantfunction():
     transition_times = (0, 24)
     values = (20,)
     fun = models.PiecewiseConstant(transition_times, values)
-    for t in [0, 1, 8, 10, 16, 20.1, 24]:
-        assert (fun.value(t) == 20)
+    ts = [0, 1, 8, 10, 16, 20.1, 24]
+    np.testing.assert_array_equal(np.fromiter((fun.value(t) for t in ts), dtype=float, count=len(ts)), 20)
 
 
 @pytest.mark.parametrize(
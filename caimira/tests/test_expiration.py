@@ -42,6 +42,22 @@ def test_multiple():
     npt.assert_almost_equal(aerosol_expected, e.aerosols(mask))
 
 
+def test_aerosols_vectorised_masks():
+    # Masks holding arrays are not hashable, but are still cached apart.
+    e = models.Expiration(np.array([1., 5.]))
+    mask1 = models.Mask(η_inhale=np.array([0.3, 0.5]), η_exhale=np.array([0.1, 0.2]))
+    mask2 = models.Mask(η_inhale=np.array([0.3, 0.5]), η_exhale=np.array([0.3, 0.4]))
+    aerosols1 = e.aerosols(mask1)
+    assert e.aerosols(mask1) is aerosols1
+    npt.assert_array_less(e.aerosols(mask2), aerosols1)
+
+
+def test_aerosols_without_mask():
+    # A miss in the aerosols cache must not be mistaken for a None mask.
+    with pytest.raises(AttributeError):
+        models.Expiration(2.0).aerosols(None)
+
+
 @retry(tries=10)
 # Expected values obtained from analytical formulas
 @pytest.mark.parametrize(
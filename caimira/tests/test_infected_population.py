@@ -42,3 +42,9 @@ def test_infected_population_vectorisation(override_params, data_registry):
     emission_rate = infected.emission_rate(10)
     assert isinstance(emission_rate, np.ndarray)
     assert emission_rate.shape == (2, )
+
+    times = np.array([7., 8., 10., 17., 18.])
+    emission_rates = infected.emission_rate_array(times)
+    assert emission_rates.shape == (5, 2)
+    np.testing.assert_array_equal(
+        emission_rates, [np.broadcast_to(infected.emission_rate(time), (2, )) for time in times])
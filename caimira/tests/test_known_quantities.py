@@ -5,11 +5,15 @@ import pytest
 import caimira.models as models
 import caimira.data as data
 
+SARS_COV_2 = models.Virus.types['SARS_CoV_2']
+NO_MASK = models.Mask.types['No mask']
+LIGHT_ACTIVITY = models.Activity.types['Light activity']
+
 
 def test_no_mask_superspeading_emission_rate(baseline_concentration_model):
     expected_rate = 48500.
     npt.assert_allclose(
-        [baseline_concentration_model.infected.emission_rate(float(t)) for t in [0, 1, 4, 4.5, 5, 8, 9]],
+        baseline_concentration_model.infected.emission_rate_array(np.array([0, 1, 4, 4.5, 5, 8, 9])),
         [0, expected_rate, expected_rate, 0, 0, expected_rate, 0],
         rtol=1e-12
     )
@@ -25,12 +29,12 @@ def baseline_periodic_window(data_registry):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def baseline_room():
     return models.Room(volume=75, inside_temp=models.PiecewiseConstant((0., 24.), (293,)))
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def baseline_periodic_hepa():
     return models.HEPAFilter(
         active=models.PeriodicInterval(period=120, duration=15),
@@ -40,10 +44,9 @@ def baseline_periodic_hepa():
 
 def test_concentrations(baseline_concentration_model):
     # Expected concentrations were computed analytically
-    ts = [0, 4, 5, 7, 10]
-    concentrations = [baseline_concentration_model.concentration(float(t)) for t in ts]
+    ts = np.array([0, 4, 5, 7, 10])
     npt.assert_allclose(
-        concentrations,
+        baseline_concentration_model.concentration_array(ts),
         [0.000000e+00, 2.046096e+01, 3.846725e-13, 2.046096e+01, 7.231966e-27],
         rtol=1e-6
     )
@@ -55,7 +58,7 @@ def test_smooth_concentrations(baseline_concentration_model):
     dx = 0.002
     dy_limit = 0.2  # Anything more than this (in relative) is a bit steep.
     ts = np.arange(0, 10, dx)
-    concentrations = [baseline_concentration_model.concentration(float(t)) for t in ts]
+    concentrations = baseline_concentration_model.concentration_array(ts)
     assert np.abs(np.diff(concentrations)).max()/np.mean(concentrations) < dy_limit
 
 
@@ -70,10 +73,10 @@ def build_model(data_registry, interval_duration):
         infected=models.EmittingPopulation(
             data_registry=data_registry,
             number=1,
-            virus=models.Virus.types['SARS_CoV_2'],
+            virus=SARS_COV_2,
             presence=models.SpecificInterval(((0., 4.), (5., 8.))),
-            mask=models.Mask.types['No mask'],
-            activity=models.Activity.types['Light activity'],
+            mask=NO_MASK,
+            activity=LIGHT_ACTIVITY,
             known_individual_emission_rate=970 * 50,
             host_immunity=0.,
             # Superspreading event, where ejection factor is fixed based
@@ -92,6 +95,15 @@ def test_concentrations_startup(data_registry):
 
     assert m1.concentration(1.) == m2.concentration(1.)
 
+    # Both are given by the analytic solution with a constant removal rate,
+    # starting from a zero concentration at the first presence (t=0).
+    removal_rate = m1.removal_rate(1.)
+    npt.assert_allclose(
+        m1.concentration(1.),
+        m1.infected.emission_rate(1.) / (m1.room.volume * removal_rate) * (1 - np.exp(-removal_rate)),
+        rtol=1e-12,
+    )
+
 
 def test_r0(baseline_exposure_model):
     # Expected r0 was computed with a trapezoidal integration, using
@@ -103,7 +115,7 @@ def test_r0(baseline_exposure_model):
 def test_periodic_window(baseline_periodic_window, baseline_room):
     # Interesting transition times for a period of 120 and duration of 15.
     ts = [0, 14/60, 15/60, 16/60, 119/60, 120/60, 121/60, 239/60, 240/60]
-    aes = [baseline_periodic_window.air_exchange(baseline_room, t) for t in ts]
+    aes = baseline_periodic_window.air_exchange_at_times(baseline_room, ts)
     rate = 6.86347
     answers = [0, rate, rate, 0, 0, 0, rate, 0, 0]
     npt.assert_allclose(aes, answers, rtol=1e-5)
@@ -113,7 +125,7 @@ def test_periodic_hepa(baseline_periodic_hepa, baseline_room):
     # Interesting transition times for a period of 120 and duration of 15.
     ts = [0, 14 / 60, 15 / 60, 16 / 60, 119 / 60, 120 / 60, 121 / 60, 239 / 60, 240 / 60]
     rate = 514.74 / 75
-    aes = [baseline_periodic_hepa.air_exchange(baseline_room, t) for t in ts]
+    aes = baseline_periodic_hepa.air_exchange_at_times(baseline_room, ts)
     answers = [0, rate, rate, 0, 0, 0, rate, 0, 0]
     npt.assert_allclose(aes, answers, rtol=1e-5)
 
@@ -242,10 +254,10 @@ def build_hourly_dependent_model(
         infected=models.EmittingPopulation(
             data_registry=data_registry,
             number=1,
-            virus=models.Virus.types['SARS_CoV_2'],
+            virus=SARS_COV_2,
             presence=models.SpecificInterval(intervals_presence_infected),
-            mask=models.Mask.types['No mask'],
-            activity=models.Activity.types['Light activity'],
+            mask=NO_MASK,
+            activity=LIGHT_ACTIVITY,
             known_individual_emission_rate=970 * 50,
             host_immunity=0,
         ),
@@ -267,10 +279,10 @@ def build_constant_temp_model(data_registry, outside_temp, intervals_open=((7.5,
         infected=models.EmittingPopulation(
             data_registry=data_registry,
             number=1,
-            virus=models.Virus.types['SARS_CoV_2'],
+            virus=SARS_COV_2,
             presence=models.SpecificInterval(((0., 4.), (5., 7.5))),
-            mask=models.Mask.types['No mask'],
-            activity=models.Activity.types['Light activity'],
+            mask=NO_MASK,
+            activity=LIGHT_ACTIVITY,
             known_individual_emission_rate=970 * 50,
             host_immunity=0.,
         ),
@@ -299,10 +311,10 @@ def build_hourly_dependent_model_multipleventilation(data_registry, month, inter
         infected=models.EmittingPopulation(
             data_registry=data_registry,
             number=1,
-            virus=models.Virus.types['SARS_CoV_2'],
+            virus=SARS_COV_2,
             presence=models.SpecificInterval(((0., 4.), (5., 7.5))),
-            mask=models.Mask.types['No mask'],
-            activity=models.Activity.types['Light activity'],
+            mask=NO_MASK,
+            activity=LIGHT_ACTIVITY,
             known_individual_emission_rate=970 * 50,
             host_immunity=0.,
         ),
@@ -0,0 +1,27 @@
+from caimira.utils import method_cache
+
+
+class Squarer:
+    def __init__(self):
+        self.calls = 0
+
+    @method_cache
+    def square(self, value, offset=0.):
+        self.calls += 1
+        return value ** 2 + offset
+
+
+def test_method_cache():
+    squarer = Squarer()
+    assert squarer.square(3.) == 9.
+    assert squarer.square(3.) == 9.
+    assert squarer.calls == 1
+    assert squarer.square(3., offset=1.) == 10.
+    assert squarer.calls == 2
+
+
+def test_method_cache_hash_collision():
+    # hash(-1.) == hash(-2.) in CPython.
+    squarer = Squarer()
+    assert squarer.square(-1.) == 1.
+    assert squarer.square(-2.) == 4.
@@ -83,6 +83,60 @@ def test_hinged_window_vectorisation(override_params):
     assert isinstance(window.air_exchange(room, t), np.ndarray)
 
 
+@pytest.mark.parametrize(
+    "override_params", [
+        {},
+        {'window_height': np.array([0.15, 0.20, 0.25])},
+        {'outside_temp': models.PiecewiseConstant(
+            (0, 2, 3), (np.array([20, 30, 28]), np.array([25, 30, 27]))
+        )},
+    ]
+)
+def test_window_air_exchange_at_times(override_params):
+    defaults = {
+        'window_height': 0.15,
+        'window_width': 0.15,
+        'opening_length': 0.15,
+        'outside_temp': models.PiecewiseConstant((0, 2, 3), (10, 15)),
+    }
+    defaults.update(override_params)
+    room = models.Room(volume=75, inside_temp=models.PiecewiseConstant((0, 2, 3), (20, 25)))
+    window = models.HingedWindow(models.PeriodicInterval(60, 30), **defaults)
+    ventilation = models.MultipleVentilation(
+        (window, models.AirChange(models.SpecificInterval(((0, 4), )), 0.25)))
+    times = [0., 0.25, 0.5, 1., 1.75, 2., 2.5, 3., 3.5, 4.5]
+    for v in (window, ventilation):
+        npt.assert_allclose(
+            v.air_exchange_at_times(room, times),
+            np.stack(np.broadcast_arrays(*[v.air_exchange(room, t) for t in times])),
+        )
+
+
+@pytest.mark.parametrize(
+    "window_width", [0., 0, np.array([0.15, 0., 0.25])],
+)
+def test_hinged_window_width_not_set(baseline_hingedwindow, window_width):
+    with pytest.raises(ValueError, match='window_width must be set'):
+        dataclasses.replace(baseline_hingedwindow, window_width=window_width)
+
+
+@pytest.mark.parametrize(
+    "ventilation", [
+        models.HEPAFilter(models.PeriodicInterval(60, 30), 250.),
+        models.HEPAFilter(models.PeriodicInterval(60, 30), np.array([250., 500.])),
+        models.HVACMechanical(models.PeriodicInterval(60, 30), np.array([250., 500.])),
+        models.AirChange(models.PeriodicInterval(60, 30), 0.25),
+    ]
+)
+def test_air_exchange_at_times(ventilation):
+    room = models.Room(volume=np.array([50., 75.]))
+    times = [0., 0.25, 0.5, 0.75, 1., 1.5, 2.]
+    npt.assert_allclose(
+        ventilation.air_exchange_at_times(room, times),
+        np.stack(np.broadcast_arrays(*[ventilation.air_exchange(room, t) for t in times])),
+    )
+
+
 def test_sliding_window(baseline_slidingwindow):
     assert baseline_slidingwindow.discharge_coefficient == 0.6
 
@@ -136,3 +190,8 @@ def test_multiple_vectorisation():
     r = models.MultipleVentilation([v2, v3]).air_exchange(room, t_active)
     assert isinstance(r, np.ndarray)
     np.testing.assert_array_equal(r, [10, 11, 12, 13, 14])
+
+    r = models.MultipleVentilation([v2, v3, v2]).air_exchange(room, t_active)
+    np.testing.assert_array_equal(r, [10, 12, 14, 16, 18])
+    # The ventilations' own values are left untouched by the accumulation.
+    np.testing.assert_array_equal(v2.air_exch, np.arange(5))
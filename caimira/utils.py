@@ -1,6 +1,9 @@
 import functools
 
 
+_MISSING = object()
+
+
 def method_cache(fn):
     """
     A decorator for instance based caching.
@@ -20,8 +23,11 @@ def method_cache(fn):
         if cache is None:
             cache = {}
             object.__setattr__(self, cache_name, cache)
-        cache_key = hash(args + tuple(kwargs.items()))
-        if cache_key not in cache:
-            cache[cache_key] = fn(self, *args, **kwargs)
-        return cache[cache_key]
+        # Key on the arguments themselves (not on their hash), so that
+        # arguments with colliding hashes (e.g. -1 and -2) are kept apart.
+        cache_key = args + tuple(kwargs.items()) if kwargs else args
+        result = cache.get(cache_key, _MISSING)
+        if result is _MISSING:
+            result = cache[cache_key] = fn(self, *args, **kwargs)
+        return result
     return cached_method
@@ -25,7 +25,6 @@ REQUIREMENTS: dict = {
         'Jinja2',
         'loky',
         'matplotlib',
-        'memoization',
         'mistune',
         'numpy',
         'pandas',